@@ -1,11 +1,12 @@
 import os
 import json
+from pathlib import Path
+import numpy as np
 
 from bpyrenderer import SceneManager
 from bpyrenderer.camera import add_camera
 from bpyrenderer.camera.layout import get_camera_positions_on_sphere
 from bpyrenderer.objects import add_floor_plane
-from bpyrenderer.materials import ensure_pbr_materials
 from bpyrenderer.engine import init_render_engine
 from bpyrenderer.environment import set_background_color
 from bpyrenderer.importer import load_file
@@ -15,17 +16,17 @@ from bpyrenderer.render_output import (
     enable_depth_output,
     enable_pbr_output,
 )
-from bpyrenderer.utils import convert_normal_to_webp, convert_depth_to_webp
+from bpyrenderer.utils import convert_normals_batch, convert_depth_to_webp
 
 import bpy
 
 def main():
     # Get the absolute path to the workspace
-    workspace_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    workspace_dir = Path(__file__).resolve().parents[2]
     
     # Set up paths
-    output_dir = os.path.join(workspace_dir, "outputs/intrinsic_maps")
-    model_path = os.path.join(workspace_dir, "assets/models/reflective_cone_collars.glb")
+    output_dir = str(workspace_dir / "outputs" / "intrinsic_maps")
+    model_path = str(workspace_dir / "assets" / "models" / "reflective_cone_collars.glb")
     
     os.makedirs(output_dir, exist_ok=True)
     
@@ -34,6 +35,9 @@ def main():
     scene_manager = SceneManager()
     scene_manager.clear(reset_keyframes=True)
     
+    # Keep geometry and BVH between camera frames
+    bpy.context.scene.render.use_persistent_data = True
+    
     # Set frame range explicitly
     bpy.context.scene.frame_start = 1
     bpy.context.scene.frame_end = 1
@@ -41,17 +45,17 @@ def main():
     # Configure Cycles for better quality
     bpy.context.scene.cycles.denoiser = 'OPTIX'
     bpy.context.scene.cycles.device = 'GPU'
+    bpy.context.scene.cycles.use_auto_tile = False  # One launch per frame
+    if hasattr(bpy.context.scene.cycles, "denoising_use_gpu"):  # Blender 4.1+
+        bpy.context.scene.cycles.denoising_use_gpu = True
     
     # Import model and prepare materials
     load_file(model_path)
     scene_manager.smooth()
-    scene_manager.clear_normal_map()
-    scene_manager.set_material_transparency(False)
-    scene_manager.set_materials_opaque()  # Important for normal maps
+    # Clear normal maps, make materials opaque (important for normal maps)
+    # and ensure all materials use Principled BSDF
+    scene_manager.prepare_materials_for_normals()
     scene_manager.normalize_scene(1.0)
-
-    # Ensure all materials use Principled BSDF
-    ensure_pbr_materials()
     
     # Get the scene bounding box to place floor right below objects
     bbox_min, bbox_max = scene_manager.get_scene_bbox()
@@ -76,6 +80,10 @@ def main():
         elevations=[15, 45],
         num_camera_per_layer=2
     )
+    cam_pos = np.asarray(cam_pos, dtype=np.float64)
+    cam_mats = np.asarray(cam_mats, dtype=np.float64)
+    elevations = np.asarray(elevations, dtype=np.float64)
+    azimuths = np.asarray(azimuths, dtype=np.float64)
     
     # Render settings
     width, height = 1024, 1024
@@ -102,23 +110,25 @@ def main():
     scene_manager.render()
     
     # Convert normal maps to WEBP format
-    for file in os.listdir(output_dir):
-        if file.startswith("normal_") and file.endswith(".exr"):
-            filepath = os.path.join(output_dir, file)
-            render_filepath = filepath.replace("normal_", "render_").replace(
-                ".exr", ".webp"
-            )
-            convert_normal_to_webp(
-                filepath,
-                filepath.replace(".exr", ".webp"),
-                render_filepath,
-            )
-            os.remove(filepath)
+    # List the output directory once, scandir entries carry their paths
+    with os.scandir(output_dir) as it:
+        entries = list(it)
+    normal_files = sorted(
+        e.path for e in entries if e.name.startswith("normal_") and e.name.endswith(".exr")
+    )
+    convert_normals_batch(
+        normal_files,
+        [f.replace(".exr", ".webp") for f in normal_files],
+        [f.replace("normal_", "render_").replace(".exr", ".webp") for f in normal_files],
+    )
+    for filepath in normal_files:
+        os.remove(filepath)
     
     # Convert depth maps to WEBP format
-    depth_files = [f for f in os.listdir(output_dir) if f.startswith("depth_") and f.endswith(".exr")]
-    if depth_files:
-        src_files = [os.path.join(output_dir, f) for f in depth_files]
+    src_files = sorted(
+        e.path for e in entries if e.name.startswith("depth_") and e.name.endswith(".exr")
+    )
+    if src_files:
         dst_files = [f.replace(".exr", ".webp") for f in src_files]
         min_depth, scale = convert_depth_to_webp(src_files, dst_files)
     
@@ -126,31 +136,29 @@ def main():
     meta_info = {
         "width": width,
         "height": height,
-        "cameras": []
+        "cameras": [
+            {
+                "index": f"{i:04d}",
+                "position": pos,
+                "elevation": elevation,
+                "azimuth": azimuth,
+                "transform_matrix": mat
+            }
+            for i, (pos, elevation, azimuth, mat) in enumerate(zip(
+                cam_pos.tolist(), elevations.tolist(), azimuths.tolist(), cam_mats.tolist()
+            ))
+        ]
     }
-    for i, (camera, pos) in enumerate(zip(cameras, cam_pos)):
-        meta_info["cameras"].append({
-            "index": f"{i:04d}",
-            "position": list(pos),
-            "elevation": elevations[i],
-            "azimuth": azimuths[i],
-            "transform_matrix": [list(row) for row in cam_mats[i]]
-        })
     
     with open(os.path.join(output_dir, "meta.json"), "w") as f:
-        json.dump(meta_info, f, indent=4)
+        json.dump(meta_info, f)
     
     # Save the scene with all objects and cameras
     blend_file = os.path.join(output_dir, "scene.blend")
     bpy.ops.wm.save_as_mainfile(filepath=blend_file)
     
-    # Clean up cameras
-    for camera in cameras:
-        try:
-            if camera.name in bpy.data.objects:
-                bpy.data.objects.remove(camera, do_unlink=True)
-        except ReferenceError:
-            continue  # Skip if camera was already removed
+    # add_camera() always returns the scene camera, so there is one object to remove
+    bpy.data.batch_remove(ids=[cameras[0]])
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
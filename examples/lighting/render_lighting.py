@@ -1,10 +1,15 @@
 import os
+import sys
 import json
 import math
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
 
 from bpyrenderer import SceneManager
 from bpyrenderer.engine import init_render_engine
-from bpyrenderer.environment import set_env_map, set_background_color, clear_environment
+from bpyrenderer.environment import set_env_map
 from bpyrenderer.lighting import (
     generate_random_lighting_setup,
     setup_lighting_from_metadata,
@@ -14,6 +19,8 @@ from bpyrenderer.render_output import enable_color_output
 
 import bpy
 
+LIGHTING_TYPES = ['studio', 'dramatic', 'natural', 'random', 'env_map']
+
 def disable_all_passes():
     """Disable all render passes except color."""
     # Get the active view layer
@@ -31,136 +38,276 @@ def disable_all_passes():
     if scene.use_nodes and scene.node_tree:
         scene.node_tree.nodes.clear()
 
-def main():
-    # Get the absolute path to the workspace
-    workspace_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+def set_constant_interpolation(id_data):
+    """Hold every keyframed value of a datablock until its next keyframe."""
+    anim = id_data.animation_data
+    if anim is None or anim.action is None:
+        return
+    for fcurve in anim.action.fcurves:
+        for keyframe in fcurve.keyframe_points:
+            keyframe.interpolation = "CONSTANT"
+
+def repeat_camera_frames(num_repeats):
+    """Repeat the camera animation of the current frame range `num_repeats` times.
     
-    # Set up paths
-    intrinsic_maps_dir = os.path.join(workspace_dir, "outputs/intrinsic_maps")
-    output_dir = os.path.join(workspace_dir, "outputs/lighting_renders")
-    env_map_path = os.path.join(workspace_dir, "assets/env_textures/brown_photostudio_02_1k.exr")
-    scene_blend_path = os.path.join(intrinsic_maps_dir, "scene.blend")
+    Returns:
+        int: Number of camera views in the original frame range
+    """
+    scene = bpy.context.scene
+    camera = scene.camera
+    frame_start, frame_end = scene.frame_start, scene.frame_end
+    num_views = frame_end - frame_start + 1
     
-    os.makedirs(output_dir, exist_ok=True)
+    for frame in range(frame_start, frame_end + 1):
+        scene.frame_set(frame)
+        for repeat in range(1, num_repeats):
+            target = frame + repeat * num_views
+            camera.keyframe_insert(data_path="location", frame=target)
+            camera.keyframe_insert(data_path="rotation_euler", frame=target)
+            for data_path in ["type", "sensor_width", "lens", "ortho_scale"]:
+                camera.data.keyframe_insert(data_path=data_path, frame=target)
     
-    # Load metadata for saving with lighting info
-    with open(os.path.join(intrinsic_maps_dir, "meta.json"), "r") as f:
-        meta_info = json.load(f)
+    scene.frame_end = frame_start + num_repeats * num_views - 1
+    scene.frame_set(frame_start)
+    return num_views
+
+def setup_keyed_world(env_map_path, world_keys):
+    """Build a world that switches between the env map and a dark background per frame.
     
-    # Load the saved scene with all configurations
+    Args:
+        env_map_path: Path to the environment map image
+        world_keys: List of (frame, use_env_map, strength) tuples to keyframe
+    """
+    set_env_map(env_path=env_map_path, rotation=(0, 0, 0), strength=0.3)
+    
+    world = bpy.context.scene.world
+    nodes = world.node_tree.nodes
+    links = world.node_tree.links
+    env_background = nodes["__background__"]
+    
+    color_background = nodes.new(type="ShaderNodeBackground")
+    color_background.inputs["Color"].default_value = (0.1, 0.1, 0.1, 1.0)
+    mix = nodes.new(type="ShaderNodeMixShader")
+    links.new(env_background.outputs["Background"], mix.inputs[1])
+    links.new(color_background.outputs["Background"], mix.inputs[2])
+    links.new(mix.outputs["Shader"], nodes["__output__"].inputs["Surface"])
+    
+    for frame, use_env_map, strength in world_keys:
+        mix.inputs["Fac"].default_value = 0.0 if use_env_map else 1.0
+        env_background.inputs["Strength"].default_value = strength if use_env_map else 0.0
+        color_background.inputs["Strength"].default_value = 0.0 if use_env_map else strength
+        for socket in [mix.inputs["Fac"], env_background.inputs["Strength"], color_background.inputs["Strength"]]:
+            socket.keyframe_insert("default_value", frame=frame)
+    
+    set_constant_interpolation(world.node_tree)
+
+def load_scene(scene_blend_path):
+    """Open the pre-processed scene and prepare it for color-only rendering."""
     bpy.ops.wm.open_mainfile(filepath=scene_blend_path)
     
+    # Keep geometry, textures and BVH on the device between frames
+    bpy.context.scene.render.use_persistent_data = True
+    
+    # Render each frame in a single launch and denoise on the GPU
+    bpy.context.scene.cycles.use_auto_tile = False
+    if hasattr(bpy.context.scene.cycles, "denoising_use_gpu"):  # Blender 4.1+
+        bpy.context.scene.cycles.denoising_use_gpu = True
+    
     # Disable all passes and clear output nodes
     disable_all_passes()
 
-    # Example 1: Generate random setups for each lighting type
-    lighting_types = ['studio', 'dramatic', 'natural', 'random', 'env_map']
+def new_light_rig(name):
+    """Create a collection for a light rig and make it the target of new lights."""
+    collection = bpy.data.collections.new(f"LightRigs/{name}")
+    bpy.context.scene.collection.children.link(collection)
+    view_layer = bpy.context.view_layer
+    view_layer.active_layer_collection = view_layer.layer_collection.children[collection.name]
+    return collection
+
+def remove_light_rigs(collections):
+    """Remove light rig collections together with their lights."""
+    view_layer = bpy.context.view_layer
+    view_layer.active_layer_collection = view_layer.layer_collection
+    bpy.data.batch_remove(ids=[obj for c in collections for obj in c.objects] + list(collections))
+
+def get_world_key(frame, lighting_setup):
+    """Get the (frame, use_env_map, strength) world keyframe of a lighting setup."""
+    if lighting_setup['lighting_type'] == 'env_map':
+        # Pure environment lighting
+        return (frame, True, lighting_setup['env_map']['strength'])
+    elif lighting_setup['lighting_type'] in ['natural', 'studio']:
+        # Use environment map with reduced strength for ambient light
+        return (frame, True, 0.3)
+    # Dark background for dramatic and random setups
+    return (frame, False, 0.1)
+
+def render_setups(scene_manager, lighting_types, output_dir, env_map_path, meta_info):
+    """Render random setups of the given lighting types in one animation pass.
     
-    for lighting_type in lighting_types:
-        setup_dir = os.path.join(output_dir, f"{lighting_type}_example")
-        os.makedirs(setup_dir, exist_ok=True)
-        
-        # Clear existing lights and environment
-        clear_lights()
-        clear_environment()
-        
-        # Generate random lighting setup for specific type
+    Every setup gets its own block of frames (one frame per camera view), so
+    all setups are rendered by a single animation render of one scene. When
+    the studio setup is rendered, its recreation from the saved metadata is
+    rendered as an extra block of the same pass.
+    """
+    setup_names = [f"{lighting_type}_example" for lighting_type in lighting_types]
+    if 'studio' in lighting_types:
+        setup_names.append("metadata_recreation")
+    
+    frame_start = bpy.context.scene.frame_start
+    frame_end = bpy.context.scene.frame_end
+    num_views = repeat_camera_frames(len(setup_names))
+    
+    # Start from a scene without lights and keep the world for restoring later
+    clear_lights()
+    scene = bpy.context.scene
+    baseline_world = scene.world
+    scene.world = baseline_world.copy() if baseline_world else None
+    
+    # Example 1: Generate random setups for each lighting type
+    rigs = []
+    rig_collections = []
+    for lighting_type, setup_name in zip(lighting_types, setup_names):
+        rig_collections.append(new_light_rig(setup_name))
         lights, lighting_metadata = generate_random_lighting_setup(lighting_type)
-        
-        # Set environment lighting based on type
-        if lighting_type == 'env_map':
-            # Pure environment lighting
-            set_env_map(
-                env_path=env_map_path,
-                rotation=(0, 0, 0),
-                strength=lighting_metadata['env_map']['strength']
-            )
-        elif lighting_type in ['natural', 'studio']:
-            # Use environment map with reduced strength for ambient light
-            set_env_map(
-                env_path=env_map_path,
-                rotation=(0, 0, 0),
-                strength=0.3
-            )
-        else:
-            # Dark background for dramatic and random setups
-            set_background_color([0.1, 0.1, 0.1, 1.0], strength=0.1)
-        
-        # Setup render output
-        enable_color_output(
-            bpy.context.scene.render.resolution_x, 
-            bpy.context.scene.render.resolution_y, 
-            setup_dir,
-            mode="PNG",
-            film_transparent=False
-        )
-        
-        # Single render call for all frames
-        scene_manager = SceneManager()
-        scene_manager.render()
-        
-        # Save lighting metadata
         lighting_meta = {
             "width": bpy.context.scene.render.resolution_x,
             "height": bpy.context.scene.render.resolution_y,
             "lighting_setup": lighting_metadata,
             "base_meta": meta_info
         }
+        rigs.append((lights, lighting_meta))
         
+        # Save lighting metadata
+        setup_dir = os.path.join(output_dir, setup_name)
+        os.makedirs(setup_dir, exist_ok=True)
         with open(os.path.join(setup_dir, "lighting_meta.json"), "w") as f:
             json.dump(lighting_meta, f, indent=4)
-        
-        # Clean up lights
-        clear_lights()
     
     # Example 2: Load and use existing metadata
-    metadata_path = os.path.join(output_dir, "studio_example/lighting_meta.json")
-    if os.path.exists(metadata_path):
-        with open(metadata_path, "r") as f:
+    if 'studio' in lighting_types:
+        with open(os.path.join(output_dir, "studio_example/lighting_meta.json"), "r") as f:
             saved_meta = json.load(f)
+        rig_collections.append(new_light_rig("metadata_recreation"))
+        lights = setup_lighting_from_metadata(saved_meta["lighting_setup"])
+        rigs.append((lights, saved_meta))
         
         setup_dir = os.path.join(output_dir, "metadata_recreation")
         os.makedirs(setup_dir, exist_ok=True)
-        
-        # Clear existing lights and environment
-        clear_lights()
-        clear_environment()
-        
-        # Recreate lighting from saved metadata
-        lights = setup_lighting_from_metadata(saved_meta["lighting_setup"])
-        
-        # Set appropriate environment lighting
-        if saved_meta["lighting_setup"]["lighting_type"] == "env_map":
-            set_env_map(
-                env_path=env_map_path,
-                rotation=(0, 0, 0),
-                strength=saved_meta["lighting_setup"]["env_map"]["strength"]
-            )
-        elif saved_meta["lighting_setup"]["lighting_type"] in ["natural", "studio"]:
-            set_env_map(
-                env_path=env_map_path,
-                rotation=(0, 0, 0),
-                strength=0.3
-            )
-        else:
-            set_background_color([0.1, 0.1, 0.1, 1.0], strength=0.1)
-        
-        # Setup render output
-        enable_color_output(
-            bpy.context.scene.render.resolution_x, 
-            bpy.context.scene.render.resolution_y, 
-            setup_dir,
-            mode="PNG",
-            film_transparent=False
-        )
-        
-        # Single render call for all frames
-        scene_manager = SceneManager()
-        scene_manager.render()
-        
-        # Save lighting metadata
         with open(os.path.join(setup_dir, "lighting_meta.json"), "w") as f:
             json.dump(saved_meta, f, indent=4)
+    
+    # Only the lights of the active setup are visible in each block
+    world_keys = []
+    for index, (lights, lighting_meta) in enumerate(rigs):
+        block_start = frame_start + index * num_views
+        world_keys.append(get_world_key(block_start, lighting_meta["lighting_setup"]))
+        for light in lights:
+            for block in range(len(rigs)):
+                light.hide_render = block != index
+                light.keyframe_insert(data_path="hide_render", frame=frame_start + block * num_views)
+            set_constant_interpolation(light)
+    
+    setup_keyed_world(env_map_path, world_keys)
+    
+    # Setup render output, frames are staged in a private directory since
+    # several worker processes may render into the same output directory
+    staging_dir = tempfile.mkdtemp(prefix="frames_", dir=output_dir)
+    enable_color_output(
+        bpy.context.scene.render.resolution_x, 
+        bpy.context.scene.render.resolution_y, 
+        staging_dir,
+        mode="PNG",
+        film_transparent=False
+    )
+    
+    # Single render call for all setups and frames
+    scene_manager.render()
+    
+    # Move the frames of each setup into its own directory
+    file_extension = bpy.context.scene.render.file_extension
+    for index, setup_name in enumerate(setup_names):
+        for view in range(num_views):
+            src_frame = frame_start + index * num_views + view
+            os.replace(
+                os.path.join(staging_dir, f"render_{src_frame:04d}{file_extension}"),
+                os.path.join(output_dir, setup_name, f"render_{frame_start + view:04d}{file_extension}")
+            )
+    os.rmdir(staging_dir)
+    
+    # Clean up lights, restore the original world and frame range
+    remove_light_rigs(rig_collections)
+    keyed_world = scene.world
+    scene.world = baseline_world
+    bpy.data.worlds.remove(keyed_world)
+    scene.frame_end = frame_end
+
+def launch_workers(lighting_types, num_gpus):
+    """Render the lighting types in parallel Blender processes, one per GPU."""
+    blender = bpy.app.binary_path or "blender"
+    processes = []
+    for gpu in range(num_gpus):
+        worker_types = lighting_types[gpu::num_gpus]
+        if not worker_types:
+            continue
+        processes.append(subprocess.Popen(
+            [
+                blender, "-b", "--python", os.path.abspath(__file__), "--",
+                "--lighting-types", *worker_types,
+                "--num-gpus", str(num_gpus),
+                "--gpu", str(gpu),
+            ],
+            env={**os.environ, "CUDA_VISIBLE_DEVICES": str(gpu)}
+        ))
+    
+    # Wait for every worker so none is left running when another one fails
+    exit_codes = [process.wait() for process in processes]
+    failed = [code for code in exit_codes if code != 0]
+    if failed:
+        raise RuntimeError(f"{len(failed)} render worker(s) failed with exit codes {failed}")
+
+def parse_args():
+    """Parse the script arguments passed after `--`."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lighting-types", nargs="+", choices=LIGHTING_TYPES, default=LIGHTING_TYPES)
+    parser.add_argument("--num-gpus", type=int, default=1, help="Number of parallel render processes")
+    parser.add_argument("--gpu", type=int, default=None, help="GPU index, only set for worker processes")
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    
+    # Get the absolute path to the workspace
+    workspace_dir = Path(__file__).resolve().parents[2]
+    
+    # Set up paths
+    intrinsic_maps_dir = workspace_dir / "outputs" / "intrinsic_maps"
+    output_dir = str(workspace_dir / "outputs" / "lighting_renders")
+    env_map_path = str(workspace_dir / "assets" / "env_textures" / "brown_photostudio_02_1k.exr")
+    scene_blend_path = str(intrinsic_maps_dir / "scene.blend")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Load metadata for saving with lighting info
+    with open(intrinsic_maps_dir / "meta.json", "r") as f:
+        meta_info = json.load(f)
+    
+    scene_manager = SceneManager()
+    
+    if args.gpu is not None:
+        # Worker process: render the assigned setups on its own GPU and keep
+        # the CPU side (denoiser, compositor) from oversubscribing the host
+        load_scene(scene_blend_path)
+        bpy.context.scene.render.threads_mode = 'FIXED'
+        bpy.context.scene.render.threads = max(1, min(4, (os.cpu_count() or 1) // args.num_gpus))
+        render_setups(scene_manager, args.lighting_types, output_dir, env_map_path, meta_info)
+        return
+    
+    if args.num_gpus > 1:
+        launch_workers(args.lighting_types, args.num_gpus)
+    else:
+        load_scene(scene_blend_path)
+        render_setups(scene_manager, args.lighting_types, output_dir, env_map_path, meta_info)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -1,6 +1,8 @@
 import os
-import random
+import sys
 import json
+import argparse
+from pathlib import Path
 import numpy as np
 from mathutils import Vector, Euler
 
@@ -8,17 +10,17 @@ from bpyrenderer import SceneManager
 from bpyrenderer.camera import add_camera
 from bpyrenderer.camera.layout import get_camera_positions_on_sphere
 from bpyrenderer.objects import add_floor_plane
-from bpyrenderer.materials import ensure_pbr_materials
 from bpyrenderer.engine import init_render_engine
 from bpyrenderer.environment import set_env_map, set_background_color
 from bpyrenderer.importer import load_file
+from bpyrenderer.lighting import blackbody_to_rgb_batch
 from bpyrenderer.render_output import (
     enable_color_output,
     enable_depth_output,
     enable_albedo_output,
     enable_normals_output,
 )
-from bpyrenderer.utils import convert_normal_to_webp
+from bpyrenderer.utils import convert_normals_batch
 
 import bpy
 
@@ -35,27 +37,30 @@ def add_point_light(location, energy=1000, color=(1, 1, 1), size=0.1):
     light_obj.location = location
     return light_obj
 
-def setup_random_lighting(num_lights=3):
+def setup_random_lighting(num_lights=3, rng=None):
     """Set up random point lights in the scene."""
-    lights = []
-    for i in range(num_lights):
-        # Random position in a sphere
-        theta = random.uniform(0, 2 * np.pi)
-        phi = random.uniform(0, np.pi)
-        r = random.uniform(2, 4)
-        
-        x = r * np.sin(phi) * np.cos(theta)
-        y = r * np.sin(phi) * np.sin(theta)
-        z = r * np.cos(phi)
-        
-        # Random color temperature (warm to cool)
-        temp = random.uniform(2700, 6500)
-        color = blackbody_to_rgb(temp)
-        
-        energy = random.uniform(500, 2000)
-        light = add_point_light((x, y, z), energy, color)
-        lights.append(light)
-    return lights
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    # Random positions in a sphere
+    theta = rng.uniform(0, 2 * np.pi, num_lights)
+    phi = rng.uniform(0, np.pi, num_lights)
+    r = rng.uniform(2, 4, num_lights)
+    sin_phi = np.sin(phi)
+    positions = np.stack([
+        r * sin_phi * np.cos(theta),
+        r * sin_phi * np.sin(theta),
+        r * np.cos(phi)
+    ], axis=1)
+    
+    # Random color temperature (warm to cool)
+    colors = blackbody_to_rgb_batch(rng.uniform(2700, 6500, num_lights))
+    energies = rng.uniform(500, 2000, num_lights)
+    
+    return [
+        add_point_light(tuple(positions[i]), energies[i], tuple(colors[i]))
+        for i in range(num_lights)
+    ]
 
 def blackbody_to_rgb(temperature):
     """Approximate RGB color from color temperature."""
@@ -70,14 +75,27 @@ def blackbody_to_rgb(temperature):
         b = 0.8 + 0.2 * (temperature - 4000) / 2500
     return (r, g, b)
 
+def parse_args():
+    """Parse the script arguments passed after `--`."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=None, help="Random seed, drawn from OS entropy if omitted")
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
+    
+    # Draw a seed if none was given so every render can be replayed
+    seed = args.seed if args.seed is not None else int(np.random.SeedSequence().entropy % 2**32)
+    rng = np.random.default_rng(seed)
+    
     # Get the absolute path to the workspace
-    workspace_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    workspace_dir = Path(__file__).resolve().parents[2]
     
     # Set up paths
-    output_dir = os.path.join(workspace_dir, "outputs/advanced_render")
-    model_path = os.path.join(workspace_dir, "assets/models/reflective_cone_collars.glb")
-    env_map_path = os.path.join(workspace_dir, "assets/env_textures/brown_photostudio_02_1k.exr")
+    output_dir = str(workspace_dir / "outputs" / "advanced_render")
+    model_path = str(workspace_dir / "assets" / "models" / "reflective_cone_collars.glb")
+    env_map_path = str(workspace_dir / "assets" / "env_textures" / "brown_photostudio_02_1k.exr")
     
     os.makedirs(output_dir, exist_ok=True)
     
@@ -89,6 +107,9 @@ def main():
     scene_manager = SceneManager()
     scene_manager.clear(reset_keyframes=True)
     
+    # Keep geometry and BVH between camera frames
+    bpy.context.scene.render.use_persistent_data = True
+    
     # Set frame range explicitly
     bpy.context.scene.frame_start = 1
     bpy.context.scene.frame_end = 1
@@ -96,19 +117,19 @@ def main():
     # Configure Cycles for better quality
     bpy.context.scene.cycles.denoiser = 'OPTIX'  # GPU denoising
     bpy.context.scene.cycles.device = 'GPU'
+    bpy.context.scene.cycles.use_auto_tile = False  # One launch per frame
+    if hasattr(bpy.context.scene.cycles, "denoising_use_gpu"):  # Blender 4.1+
+        bpy.context.scene.cycles.denoising_use_gpu = True
     # bpy.context.scene.cycles.adaptive_threshold = 0.01
     # bpy.context.scene.cycles.caustics_reflective = True
     
     # Import model and prepare materials
     load_file(model_path)
     scene_manager.smooth()
-    scene_manager.clear_normal_map()
-    scene_manager.set_material_transparency(False)
-    scene_manager.set_materials_opaque()  # Important for normal maps
+    # Clear normal maps, make materials opaque (important for normal maps)
+    # and ensure all materials use Principled BSDF
+    scene_manager.prepare_materials_for_normals()
     scene_manager.normalize_scene(1.0)
-
-    # Ensure all materials use Principled BSDF
-    ensure_pbr_materials()
     
     # Get the scene bounding box to place floor right below objects
     bbox_min, bbox_max = scene_manager.get_scene_bbox()
@@ -133,6 +154,10 @@ def main():
         elevations=[15, 45],
         num_camera_per_layer=2
     )
+    cam_pos = np.asarray(cam_pos, dtype=np.float64)
+    cam_mats = np.asarray(cam_mats, dtype=np.float64)
+    elevations = np.asarray(elevations, dtype=np.float64)
+    azimuths = np.asarray(azimuths, dtype=np.float64)
     
     # Render settings
     width, height = 1024, 1024
@@ -148,20 +173,18 @@ def main():
         os.makedirs(setup_dir, exist_ok=True)
         
         # Clear existing lights
-        for obj in bpy.data.objects:
-            if obj.type == 'LIGHT':
-                bpy.data.objects.remove(obj, do_unlink=True)
+        bpy.data.batch_remove(ids=[obj for obj in bpy.data.objects if obj.type == 'LIGHT'])
         
         # Setup lighting
         if setup == 'env_map':
-            env_map = random.choice(env_maps)
+            env_map = env_maps[rng.integers(len(env_maps))]
             set_env_map(env_map)
         else:
             set_background_color([0.0, 0.0, 0.0, 1.0])
             if setup == 'single_point':
                 add_point_light((2, 2, 3), 1500)
             else:  # multi_point
-                setup_random_lighting(3)
+                setup_random_lighting(3, rng)
         
         # Add all cameras first
         cameras = []
@@ -179,45 +202,43 @@ def main():
         scene_manager.render()
         
         # Convert normal maps to WEBP format
-        for file in os.listdir(setup_dir):
-            if file.startswith("normal_") and file.endswith(".exr"):
-                filepath = os.path.join(setup_dir, file)
-                render_filepath = filepath.replace("normal_", "render_").replace(
-                    ".exr", ".webp"
-                )
-                convert_normal_to_webp(
-                    filepath,
-                    filepath.replace(".exr", ".webp"),
-                    render_filepath,
-                )
-                os.remove(filepath)
+        with os.scandir(setup_dir) as entries:
+            normal_files = sorted(
+                e.path for e in entries if e.name.startswith("normal_") and e.name.endswith(".exr")
+            )
+        convert_normals_batch(
+            normal_files,
+            [f.replace(".exr", ".webp") for f in normal_files],
+            [f.replace("normal_", "render_").replace(".exr", ".webp") for f in normal_files],
+        )
+        for filepath in normal_files:
+            os.remove(filepath)
         
         # Save metadata
         meta_info = {
             "width": width,
             "height": height,
             "lighting_setup": setup,
-            "cameras": []
+            "seed": seed,
+            "cameras": [
+                {
+                    "index": f"{i:04d}",
+                    "position": pos,
+                    "elevation": elevation,
+                    "azimuth": azimuth,
+                    "transform_matrix": mat
+                }
+                for i, (pos, elevation, azimuth, mat) in enumerate(zip(
+                    cam_pos.tolist(), elevations.tolist(), azimuths.tolist(), cam_mats.tolist()
+                ))
+            ]
         }
-        for i, (camera, pos) in enumerate(zip(cameras, cam_pos)):
-            meta_info["cameras"].append({
-                "index": f"{i:04d}",
-                "position": list(pos),
-                "elevation": elevations[i],
-                "azimuth": azimuths[i],
-                "transform_matrix": [list(row) for row in cam_mats[i]]
-            })
         
         with open(os.path.join(setup_dir, "meta.json"), "w") as f:
-            json.dump(meta_info, f, indent=4)
+            json.dump(meta_info, f)
         
-        # Clean up cameras
-        for camera in cameras:
-            try:
-                if camera.name in bpy.data.objects:
-                    bpy.data.objects.remove(camera, do_unlink=True)
-            except ReferenceError:
-                continue  # Skip if camera was already removed
+        # add_camera() always returns the scene camera, so there is one object to remove
+        bpy.data.batch_remove(ids=[cameras[0]])
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
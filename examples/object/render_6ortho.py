@@ -16,10 +16,15 @@ from bpyrenderer.render_output import (
 )
 from bpyrenderer import SceneManager
 from bpyrenderer.camera.layout import get_camera_positions_on_sphere
-from bpyrenderer.utils import convert_normal_to_webp
+from bpyrenderer.utils import convert_normals_batch
 
 output_dir = "outputs"
 
+# Optional render passes besides color
+enable_depth = False
+enable_normals = False
+enable_albedo = False
+
 # 1. Init engine and scene manager
 init_render_engine("BLENDER_EEVEE")
 scene_manager = SceneManager()
@@ -32,7 +37,8 @@ load_file("../../assets/models/glb_example.glb")
 scene_manager.smooth()
 scene_manager.clear_normal_map()
 scene_manager.set_material_transparency(False)
-scene_manager.set_materials_opaque()  # !!! Important for render normal but may cause render error !!!
+if enable_normals:
+    scene_manager.set_materials_opaque()  # !!! Important for render normal but may cause render error !!!
 scene_manager.normalize_scene(1.0)
 
 # 3. Set environment
@@ -46,6 +52,10 @@ cam_pos, cam_mats, elevations, azimuths = get_camera_positions_on_sphere(
     elevations=[15, 45],
     num_camera_per_layer=2
 )
+cam_pos = np.asarray(cam_pos, dtype=np.float64)
+cam_mats = np.asarray(cam_mats, dtype=np.float64)
+elevations = np.asarray(elevations, dtype=np.float64)
+azimuths = np.asarray(azimuths, dtype=np.float64)
 
 # 5. Set render outputs
 width, height = 1024, 1024
@@ -57,9 +67,7 @@ for setup in lighting_setups:
     os.makedirs(setup_dir, exist_ok=True)
     
     # Clear existing lights
-    for obj in bpy.data.objects:
-        if obj.type == 'LIGHT':
-            bpy.data.objects.remove(obj, do_unlink=True)
+    bpy.data.batch_remove(ids=[obj for obj in bpy.data.objects if obj.type == 'LIGHT'])
     
     # Setup lighting
     if setup == 'env_map':
@@ -80,64 +88,75 @@ for setup in lighting_setups:
     
     # Setup render outputs once
     enable_color_output(width, height, setup_dir, mode="PNG", film_transparent=False)
-    # enable_depth_output(setup_dir)
-    # enable_normals_output(setup_dir)
-    # enable_albedo_output(setup_dir)
+    if enable_depth:
+        enable_depth_output(setup_dir)
+    if enable_normals:
+        enable_normals_output(setup_dir)
+    if enable_albedo:
+        enable_albedo_output(setup_dir)
     
     # Single render call for all frames
     scene_manager.render()
+    # Camera settings for the summary metadata, read before the cameras are removed
+    camera_data = cameras[0].data
+    projection_type, ortho_scale, camera_angle_x = camera_data.type, camera_data.ortho_scale, camera_data.angle_x
     
     # Save metadata
     meta_info = {
         "width": width,
         "height": height,
         "lighting_setup": setup,
-        "cameras": []
+        "cameras": [
+            {
+                "index": f"{i:04d}",
+                "position": pos,
+                "elevation": elevation,
+                "azimuth": azimuth,
+                "transform_matrix": mat
+            }
+            for i, (pos, elevation, azimuth, mat) in enumerate(zip(
+                cam_pos.tolist(), elevations.tolist(), azimuths.tolist(), cam_mats.tolist()
+            ))
+        ]
     }
-    for i, (camera, pos) in enumerate(zip(cameras, cam_pos)):
-        meta_info["cameras"].append({
-            "index": f"{i:04d}",
-            "position": pos.tolist(),
-            "elevation": elevations[i],
-            "azimuth": azimuths[i],
-            "transform_matrix": cam_mats[i].tolist()
-        })
     
     with open(os.path.join(setup_dir, "meta.json"), "w") as f:
-        json.dump(meta_info, f, indent=4)
+        json.dump(meta_info, f)
     
-    # Clean up cameras
-    for camera in cameras:
-        bpy.data.objects.remove(camera, do_unlink=True)
+    # add_camera() always returns the scene camera, so there is one object to remove
+    bpy.data.batch_remove(ids=[cameras[0]])
 
 # Optional. convert normal (.exr) into .webp
-for file in os.listdir(output_dir):
-    if file.startswith("normal_") and file.endswith(".exr"):
-        filepath = os.path.join(output_dir, file)
-        render_filepath = filepath.replace("normal_", "render_").replace(
-            ".exr", ".webp"
-        )
-        convert_normal_to_webp(
-            filepath,
-            filepath.replace(".exr", ".webp"),
-            render_filepath,
-        )
-        os.remove(filepath)
+with os.scandir(output_dir) as entries:
+    normal_files = sorted(
+        e.path for e in entries if e.name.startswith("normal_") and e.name.endswith(".exr")
+    )
+convert_normals_batch(
+    normal_files,
+    [f.replace(".exr", ".webp") for f in normal_files],
+    [f.replace("normal_", "render_").replace(".exr", ".webp") for f in normal_files],
+)
+for filepath in normal_files:
+    os.remove(filepath)
 
 # Optional. save metadata
-meta_info = {"width": width, "height": height, "locations": []}
-for i in range(len(cam_pos)):
-    index = "{0:04d}".format(i)
-    meta_info["locations"].append(
+meta_info = {
+    "width": width,
+    "height": height,
+    "locations": [
         {
-            "index": index,
-            "projection_type": cameras[i].data.type,
-            "ortho_scale": cameras[i].data.ortho_scale,
-            "camera_angle_x": cameras[i].data.angle_x,
-            "elevation": elevations[i],
-            "azimuth": azimuths[i],
-            "transform_matrix": cam_mats[i].tolist(),
+            "index": "{0:04d}".format(i),
+            "projection_type": projection_type,
+            "ortho_scale": ortho_scale,
+            "camera_angle_x": camera_angle_x,
+            "elevation": elevation,
+            "azimuth": azimuth,
+            "transform_matrix": mat,
         }
-    )
+        for i, (elevation, azimuth, mat) in enumerate(
+            zip(elevations.tolist(), azimuths.tolist(), cam_mats.tolist())
+        )
+    ],
+}
 with open(os.path.join(output_dir, "meta.json"), "w") as f:
-    json.dump(meta_info, f, indent=4)
+    json.dump(meta_info, f)
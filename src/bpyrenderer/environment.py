@@ -4,6 +4,53 @@ import bpy
 from mathutils import Vector, Euler
 from typing import List, Tuple, Optional
 
+# Names and types of the world nodes shared by all environment helpers
+_WORLD_NODES = {
+    "__tex_coord__": "ShaderNodeTexCoord",
+    "__mapping__": "ShaderNodeMapping",
+    "__env_tex__": "ShaderNodeTexEnvironment",
+    "__background__": "ShaderNodeBackground",
+    "__output__": "ShaderNodeOutputWorld",
+}
+
+
+def _link(links, from_socket, to_socket):
+    """Link two sockets unless they are already linked."""
+    if not any(link.from_socket == from_socket for link in to_socket.links):
+        links.new(from_socket, to_socket)
+
+
+def _get_or_build_world_nodes():
+    """Get the world nodes of the current scene, building them on first use.
+
+    The node tree keeps a stable TexCoord -> Mapping -> Environment Texture ->
+    Background -> Output topology, so subsequent calls only need to update node
+    values instead of rebuilding the world shader.
+
+    Returns:
+        The world node collection
+    """
+    world = bpy.context.scene.world
+    if not world:
+        world = bpy.data.worlds.new("World")
+        bpy.context.scene.world = world
+
+    world.use_nodes = True
+    nodes = world.node_tree.nodes
+    links = world.node_tree.links
+
+    if not all(name in nodes for name in _WORLD_NODES):
+        nodes.clear()
+        for name, node_type in _WORLD_NODES.items():
+            node = nodes.new(type=node_type)
+            node.name = name
+
+        links.new(nodes["__tex_coord__"].outputs["Generated"], nodes["__mapping__"].inputs["Vector"])
+        links.new(nodes["__mapping__"].outputs["Vector"], nodes["__env_tex__"].inputs["Vector"])
+
+    _link(links, nodes["__background__"].outputs["Background"], nodes["__output__"].inputs["Surface"])
+    return nodes
+
 
 def set_env_map(
     env_path: str,
@@ -21,35 +68,22 @@ def set_env_map(
     if not os.path.exists(env_path):
         raise FileNotFoundError(f"Environment map not found: {env_path}")
 
-    world = bpy.context.scene.world
-    if not world:
-        world = bpy.data.worlds.new("World")
-        bpy.context.scene.world = world
-    
-    world.use_nodes = True
-    world.node_tree.nodes.clear()
+    nodes = _get_or_build_world_nodes()
+    env_texture = nodes["__env_tex__"]
+    background = nodes["__background__"]
+    _link(
+        bpy.context.scene.world.node_tree.links,
+        env_texture.outputs["Color"],
+        background.inputs["Color"],
+    )
 
-    # Create and setup nodes
-    tex_coord = world.node_tree.nodes.new(type="ShaderNodeTexCoord")
-    mapping = world.node_tree.nodes.new(type="ShaderNodeMapping")
-    mapping.inputs["Rotation"].default_value = rotation
-    
-    env_texture = world.node_tree.nodes.new(type="ShaderNodeTexEnvironment")
-    background = world.node_tree.nodes.new(type="ShaderNodeBackground")
+    nodes["__mapping__"].inputs["Rotation"].default_value = rotation
     background.inputs["Strength"].default_value = strength
-    
-    output = world.node_tree.nodes.new(type="ShaderNodeOutputWorld")
 
-    # Link nodes
-    links = world.node_tree.links
-    links.new(tex_coord.outputs["Generated"], mapping.inputs["Vector"])
-    links.new(mapping.outputs["Vector"], env_texture.inputs["Vector"])
-    links.new(env_texture.outputs["Color"], background.inputs["Color"])
-    links.new(background.outputs["Background"], output.inputs["Surface"])
-
-    # Load environment texture
-    bpy.ops.image.open(filepath=env_path)
-    env_texture.image = bpy.data.images.get(os.path.basename(env_path))
+    # Load environment texture, reusing the image if it is already loaded
+    env_texture.image = bpy.data.images.load(
+        os.path.abspath(env_path), check_existing=True
+    )
 
 
 def set_background_color(rgba: List = [1.0, 1.0, 1.0, 1.0], strength: float = 1.0):
@@ -59,48 +93,24 @@ def set_background_color(rgba: List = [1.0, 1.0, 1.0, 1.0], strength: float = 1.
         rgba: RGBA color values (0-1)
         strength: Light emission strength
     """
-    world = bpy.context.scene.world
-    if not world:
-        world = bpy.data.worlds.new("World")
-        bpy.context.scene.world = world
-    
-    world.use_nodes = True
-    world.node_tree.nodes.clear()
+    nodes = _get_or_build_world_nodes()
+    background = nodes["__background__"]
+
+    # Detach the environment texture so the flat color is used
+    links = bpy.context.scene.world.node_tree.links
+    for link in background.inputs["Color"].links:
+        links.remove(link)
 
-    # Create nodes
-    background = world.node_tree.nodes.new(type="ShaderNodeBackground")
     background.inputs["Color"].default_value = rgba
     background.inputs["Strength"].default_value = strength
-    
-    output = world.node_tree.nodes.new(type="ShaderNodeOutputWorld")
-    
-    # Link nodes
-    world.node_tree.links.new(background.outputs["Background"], output.inputs["Surface"])
 
 
 def clear_environment():
     """Clear all environment lighting.
     
     This function:
-    1. Removes any existing environment texture
-    2. Creates a new empty world node tree
+    1. Detaches any existing environment texture
+    2. Keeps the world node tree in place
     3. Sets up a black background with zero strength (no light contribution)
     """
-    # Ensure world exists
-    world = bpy.context.scene.world
-    if not world:
-        world = bpy.data.worlds.new("World")
-        bpy.context.scene.world = world
-    
-    # Reset to empty node tree
-    world.use_nodes = True
-    world.node_tree.nodes.clear()
-    
-    # Add background node with black color (no light)
-    background = world.node_tree.nodes.new('ShaderNodeBackground')
-    background.inputs['Color'].default_value = (0, 0, 0, 1)
-    background.inputs['Strength'].default_value = 0
-    
-    output = world.node_tree.nodes.new('ShaderNodeOutputWorld')
-    world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
-
+    set_background_color((0, 0, 0, 1), strength=0)
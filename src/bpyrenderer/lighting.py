@@ -1,11 +1,81 @@
-import random
+import bisect
 import numpy as np
 import bpy
 import math
-from mathutils import Vector, Euler
 from typing import Tuple, Literal, Optional, Union, Dict, List
 
-def add_point_light(location, energy=1000, color=(1, 1, 1), size=0.1):
+# Default source of randomness for the generators below, see seed_lighting_rng
+_rng = np.random.default_rng()
+
+def seed_lighting_rng(seed: Optional[int] = None) -> None:
+    """Reseed the default random generator used for lighting setups.
+    
+    Args:
+        seed: Seed for reproducible setups, or None for fresh OS entropy
+    """
+    global _rng
+    _rng = np.random.default_rng(seed)
+
+def _sample_unit_sphere(
+    num_points: int,
+    upper_hemisphere: bool = False,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """Sample uniformly distributed unit vectors with Marsaglia's rejection method.
+    
+    Unlike sampling spherical angles uniformly, this does not cluster points at
+    the poles and needs no sin/cos evaluations.
+    
+    Args:
+        num_points: Number of unit vectors to sample
+        upper_hemisphere: Whether to mirror all vectors to z >= 0
+        rng: Random generator to draw from, defaults to the module generator
+        
+    Returns:
+        (num_points, 3) array of unit vectors
+    """
+    rng = rng if rng is not None else _rng
+    batches = []
+    remaining = num_points
+    while remaining > 0:
+        # About 79% of the candidates fall inside the unit disk
+        uv = rng.uniform(-1, 1, (2 * remaining, 2))
+        s = np.einsum('ij,ij->i', uv, uv)
+        uv, s = uv[s < 1], s[s < 1]
+        scale = 2 * np.sqrt(1 - s)
+        batch = np.stack([uv[:, 0] * scale, uv[:, 1] * scale, 1 - 2 * s], axis=1)
+        batches.append(batch[:remaining])
+        remaining -= len(batches[-1])
+    
+    points = np.concatenate(batches) if batches else np.empty((0, 3))
+    if upper_hemisphere:
+        points[:, 2] = np.abs(points[:, 2])
+    return points
+
+def _sample_sphere_positions(
+    num_points: int,
+    min_radius: float,
+    max_radius: float,
+    upper_hemisphere: bool = False,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """Sample random positions in a spherical shell around the origin.
+    
+    Args:
+        num_points: Number of positions to sample
+        min_radius: Minimum distance from origin
+        max_radius: Maximum distance from origin
+        upper_hemisphere: Whether to keep positions above the horizon
+        rng: Random generator to draw from, defaults to the module generator
+        
+    Returns:
+        (num_points, 3) array of positions
+    """
+    rng = rng if rng is not None else _rng
+    r = rng.uniform(min_radius, max_radius, num_points)
+    return _sample_unit_sphere(num_points, upper_hemisphere, rng) * r[:, None]
+
+def add_point_light(location, energy=1000, color=(1, 1, 1), size=0.1, collection=None):
     """Add a point light to the scene.
     
     Args:
@@ -13,6 +83,8 @@ def add_point_light(location, energy=1000, color=(1, 1, 1), size=0.1):
         energy (float): Light intensity/strength
         color (tuple): RGB color values (0-1)
         size (float): Light size, affects shadow softness
+        collection (bpy.types.Collection, optional): Collection to link the light to,
+            defaults to the active collection
         
     Returns:
         bpy.types.Object: The created light object
@@ -23,17 +95,23 @@ def add_point_light(location, energy=1000, color=(1, 1, 1), size=0.1):
     light_data.shadow_soft_size = size  # Controls shadow softness
     
     light_obj = bpy.data.objects.new(name="Point_Light", object_data=light_data)
-    bpy.context.collection.objects.link(light_obj)
+    (collection or bpy.context.collection).objects.link(light_obj)
     light_obj.location = location
     return light_obj
 
+AreaLightShape = Literal['SQUARE', 'RECTANGLE', 'DISK', 'ELLIPSE']
+
+# Area light shapes with an independent Y size
+_SHAPES_WITH_Y = frozenset(('RECTANGLE', 'ELLIPSE'))
+
 def add_area_light(
     location: Tuple[float, float, float],
     rotation: Tuple[float, float, float] = (0, 0, 0),
     energy: float = 1000,
     color: Tuple[float, float, float] = (1, 1, 1),
     size: Tuple[float, float] = (1, 1),
-    shape: Literal['SQUARE', 'RECTANGLE', 'DISK', 'ELLIPSE'] = 'RECTANGLE'
+    shape: AreaLightShape = 'RECTANGLE',
+    collection: Optional[bpy.types.Collection] = None
 ) -> bpy.types.Object:
     """Add an area light to the scene.
     
@@ -44,6 +122,7 @@ def add_area_light(
         color: RGB color values (0-1)
         size: (width, height) for the area light
         shape: Shape of the area light
+        collection: Collection to link the light to, defaults to the active collection
         
     Returns:
         The created light object
@@ -53,20 +132,21 @@ def add_area_light(
     light_data.color = color
     light_data.shape = shape
     light_data.size = size[0]
-    if shape in ['RECTANGLE', 'ELLIPSE']:
+    if shape in _SHAPES_WITH_Y:
         light_data.size_y = size[1]
     
     light_obj = bpy.data.objects.new(name="Area_Light", object_data=light_data)
-    bpy.context.collection.objects.link(light_obj)
+    (collection or bpy.context.collection).objects.link(light_obj)
     light_obj.location = location
-    light_obj.rotation_euler = Euler(rotation)
+    light_obj.rotation_euler = rotation
     return light_obj
 
 def add_sun_light(
     rotation: Tuple[float, float, float],
     energy: float = 1.0,
     color: Tuple[float, float, float] = (1, 1, 1),
-    angle: float = 0.526  # Default 30 degrees
+    angle: float = 0.526,  # Default 30 degrees
+    collection: Optional[bpy.types.Collection] = None
 ) -> bpy.types.Object:
     """Add a sun light to the scene.
     
@@ -75,6 +155,7 @@ def add_sun_light(
         energy: Light intensity/strength
         color: RGB color values (0-1)
         angle: Angle of the sun in radians (controls shadow softness)
+        collection: Collection to link the light to, defaults to the active collection
         
     Returns:
         The created light object
@@ -85,11 +166,24 @@ def add_sun_light(
     light_data.angle = angle
     
     light_obj = bpy.data.objects.new(name="Sun_Light", object_data=light_data)
-    bpy.context.collection.objects.link(light_obj)
-    light_obj.rotation_euler = Euler(rotation)
+    (collection or bpy.context.collection).objects.link(light_obj)
+    light_obj.rotation_euler = rotation
     return light_obj
 
-def setup_random_lighting(num_lights=3, min_radius=2, max_radius=4, min_energy=500, max_energy=2000):
+def _bulk_add(specs, collection=None) -> List[bpy.types.Object]:
+    """Create several lights, linking them all to the same collection.
+    
+    Args:
+        specs: Iterable of (add_fn, kwargs) pairs, e.g. (add_point_light, {"location": ...})
+        collection: Collection to link the lights to, defaults to the active collection
+        
+    Returns:
+        List of created light objects
+    """
+    collection = collection or bpy.context.collection
+    return [add_fn(**kwargs, collection=collection) for add_fn, kwargs in specs]
+
+def setup_random_lighting(num_lights=3, min_radius=2, max_radius=4, min_energy=500, max_energy=2000, rng=None):
     """Set up random point lights in the scene.
     
     Args:
@@ -98,25 +192,36 @@ def setup_random_lighting(num_lights=3, min_radius=2, max_radius=4, min_energy=5
         max_radius (float): Maximum distance from origin
         min_energy (float): Minimum light intensity
         max_energy (float): Maximum light intensity
+        rng (np.random.Generator, optional): Random generator to draw from,
+            defaults to the module generator (see seed_lighting_rng)
         
     Returns:
         list: List of created light objects
     """
-    lights = []
-    for i in range(num_lights):
-        # Random position in a sphere
-        theta = random.uniform(0, 2 * np.pi)
-        phi = random.uniform(0, np.pi)
-        r = random.uniform(min_radius, max_radius)
-        
-        x = r * np.sin(phi) * np.cos(theta)
-        y = r * np.sin(phi) * np.sin(theta)
-        z = r * np.cos(phi)
-        
-        energy = random.uniform(min_energy, max_energy)
-        light = add_point_light((x, y, z), energy)
-        lights.append(light)
-    return lights
+    rng = rng if rng is not None else _rng
+    positions = _sample_sphere_positions(num_lights, min_radius, max_radius, rng=rng)
+    energies = rng.uniform(min_energy, max_energy, num_lights)
+    return _bulk_add(
+        (add_point_light, {"location": pos, "energy": energy})
+        for pos, energy in zip(positions.tolist(), energies.tolist())
+    )
+
+# Placement of the three-point studio rig: key (main), fill (softer) and back (rim) lights
+_STUDIO_KEY = dict(location=(4, -4, 4), rotation=(math.pi / 4, 0.0, math.pi / 4), size=(2, 1))
+_STUDIO_FILL = dict(location=(-4, -4, 2), rotation=(math.pi / 6, 0.0, -math.pi / 4), size=(3, 2))
+_STUDIO_BACK = dict(location=(0, 4, 3), rotation=(-math.pi / 4, 0.0, 0.0), size=(2, 0.5))
+
+def _studio_light_metadata(placement: Dict, role: str, energy: float, color_temperature: float) -> Dict:
+    """Build the metadata entry for one light of the studio rig."""
+    return {
+        "type": "area",
+        "role": role,
+        "energy": energy,
+        "color_temperature": color_temperature,
+        "position": list(placement['location']),
+        "rotation": list(placement['rotation']),
+        "size": list(placement['size'])
+    }
 
 def setup_studio_lighting(
     key_light_energy: float = 1000,
@@ -139,32 +244,9 @@ def setup_studio_lighting(
     Returns:
         List of created light objects
     """
-    # Key light (main light)
-    key_light = add_area_light(
-        location=(4, -4, 4),
-        rotation=(math.radians(45), math.radians(0), math.radians(45)),
-        energy=key_light_energy,
-        color=key_light_color,
-        size=(2, 1)
-    )
-    
-    # Fill light (softer, less intense)
-    fill_light = add_area_light(
-        location=(-4, -4, 2),
-        rotation=(math.radians(30), math.radians(0), math.radians(-45)),
-        energy=fill_light_energy,
-        color=fill_light_color,
-        size=(3, 2)
-    )
-    
-    # Back light (rim light)
-    back_light = add_area_light(
-        location=(0, 4, 3),
-        rotation=(math.radians(-45), math.radians(0), math.radians(0)),
-        energy=back_light_energy,
-        color=back_light_color,
-        size=(2, 0.5)
-    )
+    key_light = add_area_light(**_STUDIO_KEY, energy=key_light_energy, color=key_light_color)
+    fill_light = add_area_light(**_STUDIO_FILL, energy=fill_light_energy, color=fill_light_color)
+    back_light = add_area_light(**_STUDIO_BACK, energy=back_light_energy, color=back_light_color)
     
     return [key_light, fill_light, back_light]
 
@@ -188,40 +270,61 @@ def blackbody_to_rgb(temperature):
         b = 0.8 + 0.2 * (temperature - 4000) / 2500
     return (r, g, b)
 
+def blackbody_to_rgb_batch(temperatures: np.ndarray) -> np.ndarray:
+    """Convert an array of color temperatures to RGB values.
+    
+    Uses the same approximation as blackbody_to_rgb.
+    
+    Args:
+        temperatures: (N,) color temperatures in Kelvin
+        
+    Returns:
+        (N, 3) array of RGB color values (0-1)
+    """
+    temperatures = np.asarray(temperatures, dtype=float)
+    warm = temperatures <= 4000
+    r = np.ones_like(temperatures)
+    g = np.where(warm, 0.7 + 0.3 * (temperatures - 2700) / 1300, 1.0)
+    b = np.where(
+        warm,
+        0.4 + 0.6 * (temperatures - 2700) / 1300,
+        0.8 + 0.2 * (temperatures - 4000) / 2500
+    )
+    return np.stack([r, g, b], axis=-1)
+
 def clear_lights():
     """Remove all lights from the scene."""
-    for obj in bpy.data.objects:
-        if obj.type == 'LIGHT':
-            bpy.data.objects.remove(obj, do_unlink=True)
+    # Deleting the light datablocks also deletes the objects using them
+    bpy.data.batch_remove(ids=list(bpy.data.lights))
+
+# Available lighting types and their cumulative probabilities:
+# studio 0.25 (professional studio lighting), dramatic 0.2 (strong contrast),
+# natural 0.25 (sun and fill), random 0.15 (point lights), env_map 0.15 (environment map only)
+_LIGHTING_TYPES = ('studio', 'dramatic', 'natural', 'random', 'env_map')
+_LIGHTING_CUM = (0.25, 0.45, 0.70, 0.85, 1.0)
 
-def generate_random_lighting_setup(lighting_type: Optional[str] = None) -> Tuple[List[bpy.types.Object], Dict]:
+def generate_random_lighting_setup(
+    lighting_type: Optional[str] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Tuple[List[bpy.types.Object], Dict]:
     """Generate a random lighting setup and return its metadata.
     
     Args:
         lighting_type: Optional specific lighting type to use. If None, randomly chosen.
                       Valid types: 'studio', 'dramatic', 'natural', 'random', 'env_map'
+        rng: Random generator all draws are taken from, defaults to the module
+             generator (see seed_lighting_rng)
     
     Returns:
         Tuple[List[bpy.types.Object], Dict]: List of created lights and metadata dictionary
     """
-    # Available lighting types and their probabilities
-    lighting_types = {
-        'studio': 0.25,     # Professional studio lighting
-        'dramatic': 0.2,    # Dramatic lighting with strong contrast
-        'natural': 0.25,    # Natural lighting with sun and fill
-        'random': 0.15,     # Random point lights
-        'env_map': 0.15     # Pure environment map lighting
-    }
-    
+    rng = rng if rng is not None else _rng
     if lighting_type is not None:
-        if lighting_type not in lighting_types:
-            raise ValueError(f"Invalid lighting type: {lighting_type}. Must be one of {list(lighting_types.keys())}")
+        if lighting_type not in _LIGHTING_TYPES:
+            raise ValueError(f"Invalid lighting type: {lighting_type}. Must be one of {list(_LIGHTING_TYPES)}")
     else:
         # Select lighting type based on probabilities
-        lighting_type = random.choices(
-            list(lighting_types.keys()),
-            weights=list(lighting_types.values())
-        )[0]
+        lighting_type = _LIGHTING_TYPES[bisect.bisect(_LIGHTING_CUM, rng.random())]
     
     # Random color temperature ranges for different lighting scenarios
     color_temps = {
@@ -239,20 +342,20 @@ def generate_random_lighting_setup(lighting_type: Optional[str] = None) -> Tuple
     if lighting_type == 'env_map':
         # Pure environment lighting - no additional lights
         metadata["env_map"] = {
-            "strength": random.uniform(0.8, 1.5)  # Random environment strength
+            "strength": rng.uniform(0.8, 1.5)  # Random environment strength
         }
         return lights, metadata
     
     elif lighting_type == 'studio':
         # Generate random studio lighting parameters
-        key_energy = random.uniform(800, 1500)
-        fill_energy = random.uniform(200, 600)
-        back_energy = random.uniform(400, 800)
+        key_energy = rng.uniform(800, 1500)
+        fill_energy = rng.uniform(200, 600)
+        back_energy = rng.uniform(400, 800)
         
         # Randomize color temperatures
-        key_temp = random.uniform(*color_temps['neutral'])
-        fill_temp = random.uniform(*color_temps['cool'])  # Slightly cooler fill light
-        back_temp = random.uniform(*color_temps['warm'])  # Warmer rim light
+        key_temp = rng.uniform(*color_temps['neutral'])
+        fill_temp = rng.uniform(*color_temps['cool'])  # Slightly cooler fill light
+        back_temp = rng.uniform(*color_temps['warm'])  # Warmer rim light
         
         lights = setup_studio_lighting(
             key_light_energy=key_energy,
@@ -264,92 +367,60 @@ def generate_random_lighting_setup(lighting_type: Optional[str] = None) -> Tuple
         )
         
         metadata["lights"] = [
-            {
-                "type": "area",
-                "role": "key",
-                "energy": key_energy,
-                "color_temperature": key_temp,
-                "position": [4, -4, 4],
-                "rotation": [math.radians(45), 0, math.radians(45)],
-                "size": [2, 1]
-            },
-            {
-                "type": "area",
-                "role": "fill",
-                "energy": fill_energy,
-                "color_temperature": fill_temp,
-                "position": [-4, -4, 2],
-                "rotation": [math.radians(30), 0, math.radians(-45)],
-                "size": [3, 2]
-            },
-            {
-                "type": "area",
-                "role": "back",
-                "energy": back_energy,
-                "color_temperature": back_temp,
-                "position": [0, 4, 3],
-                "rotation": [math.radians(-45), 0, 0],
-                "size": [2, 0.5]
-            }
+            _studio_light_metadata(_STUDIO_KEY, "key", key_energy, key_temp),
+            _studio_light_metadata(_STUDIO_FILL, "fill", fill_energy, fill_temp),
+            _studio_light_metadata(_STUDIO_BACK, "back", back_energy, back_temp)
         ]
     
     elif lighting_type == 'dramatic':
         # Generate dramatic lighting with 1-2 strong lights
-        num_lights = random.randint(1, 2)
-        for i in range(num_lights):
-            # Random position on a sphere
-            theta = random.uniform(0, 2 * np.pi)
-            phi = random.uniform(0, np.pi / 2)  # Keep lights above horizon
-            r = random.uniform(2, 4)
-            
-            pos = (
-                r * np.sin(phi) * np.cos(theta),
-                r * np.sin(phi) * np.sin(theta),
-                r * np.cos(phi)
-            )
-            
-            # Random rotation pointing at center
-            rot = (
-                math.atan2(-pos[2], math.sqrt(pos[0]**2 + pos[1]**2)),
-                0,
-                math.atan2(pos[1], pos[0]) + math.pi
-            )
-            
-            # High energy for dramatic effect
-            energy = random.uniform(1000, 2000)
-            temp = random.uniform(*color_temps['warm'])
-            size = [random.uniform(0.5, 2), random.uniform(0.5, 2)]
-            
-            light = add_area_light(
-                location=pos,
-                rotation=rot,
-                energy=energy,
-                color=blackbody_to_rgb(temp),
-                size=size,
-                shape='RECTANGLE'
-            )
-            lights.append(light)
+        num_lights = int(rng.integers(1, 3))
+        # Random positions on a sphere, kept above the horizon
+        positions = _sample_sphere_positions(num_lights, 2, 4, upper_hemisphere=True, rng=rng)
+        # High energy for dramatic effect
+        energies = rng.uniform(1000, 2000, num_lights)
+        temps = rng.uniform(*color_temps['warm'], num_lights)
+        sizes = rng.uniform(0.5, 2, (num_lights, 2))
+        
+        # Rotations pointing each light at the center
+        rotations = np.zeros((num_lights, 3))
+        rotations[:, 0] = np.arctan2(-positions[:, 2], np.hypot(positions[:, 0], positions[:, 1]))
+        rotations[:, 2] = np.arctan2(positions[:, 1], positions[:, 0]) + np.pi
+        
+        specs = []
+        for i, (pos, rot, energy, temp, size) in enumerate(zip(
+            positions.tolist(), rotations.tolist(), energies.tolist(), temps.tolist(), sizes.tolist()
+        )):
+            specs.append((add_area_light, {
+                "location": pos,
+                "rotation": rot,
+                "energy": energy,
+                "color": blackbody_to_rgb(temp),
+                "size": size,
+                "shape": 'RECTANGLE'
+            }))
             
             metadata["lights"].append({
                 "type": "area",
                 "role": f"dramatic_{i+1}",
                 "energy": energy,
                 "color_temperature": temp,
-                "position": list(pos),
-                "rotation": list(rot),
+                "position": pos,
+                "rotation": rot,
                 "size": size
             })
+        lights = _bulk_add(specs)
     
     elif lighting_type == 'natural':
         # Sun light with fill
         sun_rot = (
-            math.radians(random.uniform(-60, -30)),  # Sun elevation
-            math.radians(random.uniform(0, 360)),    # Sun rotation
+            math.radians(rng.uniform(-60, -30)),  # Sun elevation
+            math.radians(rng.uniform(0, 360)),    # Sun rotation
             0
         )
-        sun_energy = random.uniform(2, 5)
-        sun_angle = math.radians(random.uniform(0.5, 5))  # Sun size
-        sun_temp = random.uniform(*color_temps['neutral'])
+        sun_energy = rng.uniform(2, 5)
+        sun_angle = math.radians(rng.uniform(0.5, 5))  # Sun size
+        sun_temp = rng.uniform(*color_temps['neutral'])
         
         sun = add_sun_light(
             rotation=sun_rot,
@@ -361,13 +432,13 @@ def generate_random_lighting_setup(lighting_type: Optional[str] = None) -> Tuple
         
         # Add fill light
         fill_pos = (
-            random.uniform(-3, 3),
-            random.uniform(-3, 3),
-            random.uniform(1, 3)
+            rng.uniform(-3, 3),
+            rng.uniform(-3, 3),
+            rng.uniform(1, 3)
         )
-        fill_energy = random.uniform(200, 400)
-        fill_temp = random.uniform(*color_temps['cool'])
-        fill_size = [random.uniform(1, 3), random.uniform(1, 3)]
+        fill_energy = rng.uniform(200, 400)
+        fill_temp = rng.uniform(*color_temps['cool'])
+        fill_size = [rng.uniform(1, 3), rng.uniform(1, 3)]
         
         fill = add_area_light(
             location=fill_pos,
@@ -397,38 +468,31 @@ def generate_random_lighting_setup(lighting_type: Optional[str] = None) -> Tuple
         ]
     
     else:  # random point lights
-        num_lights = random.randint(2, 5)
+        num_lights = int(rng.integers(2, 6))
         min_radius = 2
         max_radius = 4
         min_energy = 300
         max_energy = 800
         
         lights = []
-        metadata["lights"] = []
         
-        for i in range(num_lights):
-            # Random position in a sphere
-            theta = random.uniform(0, 2 * np.pi)
-            phi = random.uniform(0, np.pi)
-            r = random.uniform(min_radius, max_radius)
-            
-            pos = (
-                r * np.sin(phi) * np.cos(theta),
-                r * np.sin(phi) * np.sin(theta),
-                r * np.cos(phi)
-            )
-            
-            energy = random.uniform(min_energy, max_energy)
-            temp = random.uniform(*color_temps['neutral'])  # Store the temperature
+        # Random positions in a sphere
+        positions = _sample_sphere_positions(num_lights, min_radius, max_radius, rng=rng)
+        energies = rng.uniform(min_energy, max_energy, num_lights)
+        temps = rng.uniform(*color_temps['neutral'], num_lights)  # Store the temperature
+        
+        specs = []
+        for i, (pos, energy, temp) in enumerate(zip(
+            positions.tolist(), energies.tolist(), temps.tolist()
+        )):
             color = blackbody_to_rgb(temp)
             
-            light = add_point_light(
-                location=pos,
-                energy=energy,
-                color=color,
-                size=0.1
-            )
-            lights.append(light)
+            specs.append((add_point_light, {
+                "location": pos,
+                "energy": energy,
+                "color": color,
+                "size": 0.1
+            }))
             
             metadata["lights"].append({
                 "type": "point",
@@ -436,12 +500,73 @@ def generate_random_lighting_setup(lighting_type: Optional[str] = None) -> Tuple
                 "energy": energy,
                 "color_temperature": temp,  # Store temperature in metadata
                 "color": list(color),       # Store actual color too
-                "position": list(pos),
+                "position": pos,
                 "size": 0.1
             })
+        lights = _bulk_add(specs)
     
     return lights, metadata
 
+def _area_light_from_metadata(light_info: Dict) -> bpy.types.Object:
+    return add_area_light(
+        location=light_info['position'],
+        rotation=light_info['rotation'],
+        energy=light_info['energy'],
+        color=blackbody_to_rgb(light_info['color_temperature']),
+        size=light_info['size']
+    )
+
+def _fill_light_from_metadata(light_info: Dict) -> bpy.types.Object:
+    return add_area_light(
+        location=light_info['position'],
+        energy=light_info['energy'],
+        color=blackbody_to_rgb(light_info['color_temperature']),
+        size=light_info['size']
+    )
+
+def _sun_light_from_metadata(light_info: Dict) -> bpy.types.Object:
+    return add_sun_light(
+        rotation=light_info['rotation'],
+        energy=light_info['energy'],
+        color=blackbody_to_rgb(light_info['color_temperature']),
+        angle=light_info['angle']
+    )
+
+def _point_light_from_metadata(light_info: Dict) -> bpy.types.Object:
+    # Use stored color directly instead of regenerating from temperature
+    return add_point_light(
+        location=light_info['position'],
+        energy=light_info['energy'],
+        color=light_info['color'],
+        size=light_info['size']
+    )
+
+# Field each lighting type dispatches its lights on
+_DISPATCH_FIELD = {
+    'studio': 'role',
+    'dramatic': 'type',
+    'natural': 'type',
+    'random': 'type'
+}
+
+# (lighting_type, dispatch value) -> light builder; lights without a handler are skipped
+_HANDLERS = {
+    ('studio', 'key'): _area_light_from_metadata,
+    ('studio', 'fill'): _area_light_from_metadata,
+    ('studio', 'back'): _area_light_from_metadata,
+    ('dramatic', 'area'): _area_light_from_metadata,
+    ('natural', 'sun'): _sun_light_from_metadata,
+    ('natural', 'area'): _fill_light_from_metadata,
+    ('random', 'point'): _point_light_from_metadata
+}
+
+_REQUIRED = {
+    _area_light_from_metadata: frozenset(('position', 'rotation', 'energy', 'color_temperature', 'size')),
+    _fill_light_from_metadata: frozenset(('position', 'energy', 'color_temperature', 'size')),
+    _sun_light_from_metadata: frozenset(('rotation', 'energy', 'color_temperature', 'angle')),
+    _point_light_from_metadata: frozenset(('position', 'energy', 'color', 'size'))
+}
+
 def setup_lighting_from_metadata(metadata: Dict) -> List[bpy.types.Object]:
     """Set up lighting based on provided metadata.
     
@@ -475,71 +600,16 @@ def setup_lighting_from_metadata(metadata: Dict) -> List[bpy.types.Object]:
     if 'lights' not in metadata:
         raise KeyError(f"Metadata for {lighting_type} lighting must include 'lights' array")
     
-    if lighting_type == 'studio':
-        # Create studio lights from metadata
-        for light_info in metadata['lights']:
-            if 'role' not in light_info:
-                raise KeyError("Studio light metadata must include 'role'")
-            if light_info['role'] in ['key', 'fill', 'back']:
-                light = add_area_light(
-                    location=tuple(light_info['position']),
-                    rotation=tuple(light_info['rotation']),
-                    energy=light_info['energy'],
-                    color=blackbody_to_rgb(light_info['color_temperature']),
-                    size=tuple(light_info['size'])
-                )
-                lights.append(light)
-    
-    elif lighting_type == 'dramatic':
-        # Create dramatic lights from metadata
-        for light_info in metadata['lights']:
-            if 'type' not in light_info:
-                raise KeyError("Dramatic light metadata must include 'type'")
-            if light_info['type'] == 'area':
-                light = add_area_light(
-                    location=tuple(light_info['position']),
-                    rotation=tuple(light_info['rotation']),
-                    energy=light_info['energy'],
-                    color=blackbody_to_rgb(light_info['color_temperature']),
-                    size=tuple(light_info['size']),
-                    shape='RECTANGLE'
-                )
-                lights.append(light)
-    
-    elif lighting_type == 'natural':
-        # Create natural lighting from metadata
-        for light_info in metadata['lights']:
-            if 'type' not in light_info:
-                raise KeyError("Natural light metadata must include 'type'")
-            if light_info['type'] == 'sun':
-                light = add_sun_light(
-                    rotation=tuple(light_info['rotation']),
-                    energy=light_info['energy'],
-                    color=blackbody_to_rgb(light_info['color_temperature']),
-                    angle=light_info['angle']
-                )
-                lights.append(light)
-            elif light_info['type'] == 'area':
-                light = add_area_light(
-                    location=tuple(light_info['position']),
-                    energy=light_info['energy'],
-                    color=blackbody_to_rgb(light_info['color_temperature']),
-                    size=tuple(light_info['size'])
-                )
-                lights.append(light)
-    
-    else:  # random point lights
-        for light_info in metadata['lights']:
-            if 'type' not in light_info:
-                raise KeyError("Random light metadata must include 'type'")
-            if light_info['type'] == 'point':
-                # Use stored color directly instead of regenerating from temperature
-                light = add_point_light(
-                    location=tuple(light_info['position']),
-                    energy=light_info['energy'],
-                    color=tuple(light_info['color']),  # Use stored color
-                    size=light_info['size']
-                )
-                lights.append(light)
+    dispatch_field = _DISPATCH_FIELD[lighting_type]
+    for light_info in metadata['lights']:
+        if dispatch_field not in light_info:
+            raise KeyError(f"{lighting_type.capitalize()} light metadata must include '{dispatch_field}'")
+        handler = _HANDLERS.get((lighting_type, light_info[dispatch_field]))
+        if handler is None:
+            continue
+        missing = _REQUIRED[handler] - light_info.keys()
+        if missing:
+            raise KeyError(f"{lighting_type.capitalize()} light metadata is missing {sorted(missing)}")
+        lights.append(handler(light_info))
     
     return lights 
\ No newline at end of file
@@ -1,6 +1,21 @@
 import bpy
 from typing import Tuple, Optional
 
+# Input socket indices of Principled BSDF (Base Color, Metallic, Roughness),
+# looked up on the first node created since they depend on the Blender version
+_principled_indices: Optional[Tuple[int, int, int]] = None
+
+def _get_principled_indices(shader: bpy.types.Node) -> Tuple[int, int, int]:
+    global _principled_indices
+    if _principled_indices is None:
+        inputs = shader.inputs
+        _principled_indices = (
+            inputs.find('Base Color'),
+            inputs.find('Metallic'),
+            inputs.find('Roughness')
+        )
+    return _principled_indices
+
 
 def create_material(
     name: str,
@@ -28,9 +43,11 @@ def create_material(
     
     if use_principled:
         shader = nodes.new('ShaderNodeBsdfPrincipled')
-        shader.inputs['Base Color'].default_value = base_color
-        shader.inputs['Metallic'].default_value = metallic
-        shader.inputs['Roughness'].default_value = roughness
+        base_idx, metallic_idx, roughness_idx = _get_principled_indices(shader)
+        inputs = shader.inputs
+        inputs[base_idx].default_value = base_color
+        inputs[metallic_idx].default_value = metallic
+        inputs[roughness_idx].default_value = roughness
     else:
         shader = nodes.new('ShaderNodeBsdfDiffuse')
         shader.inputs['Color'].default_value = base_color
@@ -57,27 +74,32 @@ def convert_to_principled_bsdf(
     if not material.use_nodes:
         material.use_nodes = True
     
-    nodes = material.node_tree.nodes
-    old_nodes = [n for n in nodes if n.type != 'OUTPUT_MATERIAL']
-    for node in old_nodes:
-        nodes.remove(node)
+    node_tree = material.node_tree
+    nodes = node_tree.nodes
+    output = None
+    for node in list(nodes):
+        if node.type == 'OUTPUT_MATERIAL':
+            output = output or node
+        else:
+            nodes.remove(node)
     
     principled = nodes.new('ShaderNodeBsdfPrincipled')
     
     # Keep existing values if not specified
+    base_idx, metallic_idx, roughness_idx = _get_principled_indices(principled)
+    inputs = principled.inputs
     if base_color is not None:
-        principled.inputs['Base Color'].default_value = base_color
+        inputs[base_idx].default_value = base_color
     if metallic is not None:
-        principled.inputs['Metallic'].default_value = metallic
+        inputs[metallic_idx].default_value = metallic
     if roughness is not None:
-        principled.inputs['Roughness'].default_value = roughness
+        inputs[roughness_idx].default_value = roughness
     
-    # Find or create output node
-    output = next((n for n in nodes if n.type == 'OUTPUT_MATERIAL'), None)
+    # Reuse the output node found above or create one
     if not output:
         output = nodes.new('ShaderNodeOutputMaterial')
     
-    material.node_tree.links.new(principled.outputs['BSDF'], output.inputs['Surface'])
+    node_tree.links.new(principled.outputs['BSDF'], output.inputs['Surface'])
 
 def ensure_pbr_materials(scene: Optional[bpy.types.Scene] = None) -> None:
     """Ensure all materials in the scene use Principled BSDF.
@@ -89,5 +111,6 @@ def ensure_pbr_materials(scene: Optional[bpy.types.Scene] = None) -> None:
         scene = bpy.context.scene
     
     for material in bpy.data.materials:
-        if not material.use_nodes or 'Principled BSDF' not in material.node_tree.nodes:
+        node_tree = material.node_tree
+        if not material.use_nodes or node_tree.nodes.get('Principled BSDF') is None:
             convert_to_principled_bsdf(material)
\ No newline at end of file
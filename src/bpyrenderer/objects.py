@@ -4,6 +4,31 @@ import bpy
 from typing import Tuple, Optional, Union, Dict
 from .materials import create_material
 
+# Names of floor materials keyed by their properties, shared between planes.
+# Names rather than Material references are kept, since Blender can free the
+# underlying ID (e.g. on loading a file) without invalidating the Python wrapper.
+_material_cache: Dict[str, str] = {}
+
+def _get_floor_material(material_props: Dict) -> bpy.types.Material:
+    """Return a floor material with the given properties, creating it on first use."""
+    key = repr(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in material_props.items()
+    ))
+    name = _material_cache.get(key)
+    mat = bpy.data.materials.get(name) if name is not None else None
+    # The key is stamped on the material, so a different material that took
+    # over the cached name (e.g. from a loaded file) is not mistaken for it
+    if mat is None or mat.get("_floor_key") != key:
+        mat = create_material(name="Floor_Material", **material_props)
+        mat["_floor_key"] = key
+        _material_cache[key] = mat.name
+    return mat
+
+def clear_material_cache() -> None:
+    """Forget cached floor materials, e.g. after resetting the scene."""
+    _material_cache.clear()
+
 def add_floor_plane(
     size: float = 10.0,
     location: Tuple[float, float, float] = (0, 0, -1),
@@ -25,9 +50,6 @@ def add_floor_plane(
     Returns:
         The created plane object
     """
-    bpy.ops.mesh.primitive_plane_add(size=size, location=location)
-    plane = bpy.context.active_object
-    
     # Use default material properties if none provided
     if material_props is None:
         material_props = {
@@ -37,10 +59,22 @@ def add_floor_plane(
             'use_principled': True
         }
     
-    mat = create_material(
-        name="Floor_Material",
-        **material_props
+    # Build the quad directly rather than through bpy.ops, which pushes an undo
+    # step and changes the selection. The mesh gets its material before it is
+    # linked into the scene, so the depsgraph only sees the finished object.
+    half = size / 2
+    mesh = bpy.data.meshes.new("Floor")
+    mesh.from_pydata(
+        [(-half, -half, 0), (half, -half, 0), (half, half, 0), (-half, half, 0)],
+        [],
+        [(0, 1, 2, 3)]
     )
-    plane.data.materials.append(mat)
+    mesh.uv_layers.new(name="UVMap").data.foreach_set("uv", (0, 0, 1, 0, 1, 1, 0, 1))
+    mesh.materials.append(_get_floor_material(material_props))
+    mesh.update()
+    
+    plane = bpy.data.objects.new("Floor", mesh)
+    plane.location = location
+    bpy.context.collection.objects.link(plane)
     
     return plane
@@ -6,6 +6,8 @@ import bpy
 import mathutils
 from mathutils import Vector
 from typing import Optional, Literal
+from .materials import convert_to_principled_bsdf
+from .objects import clear_material_cache
 from .utils import get_keyframes
 
 
@@ -190,6 +192,46 @@ class SceneManager:
 
             material.blend_method = "OPAQUE"
 
+    def prepare_materials_for_normals(
+        self,
+        clear_normals: bool = True,
+        opaque: bool = True,
+        transparency: Optional[bool] = False,
+        ensure_pbr: bool = True,
+    ) -> None:
+        """Prepare all materials for rendering normal maps in a single pass.
+
+        Equivalent to calling clear_normal_map(), set_material_transparency(),
+        set_materials_opaque() and ensure_pbr_materials() one after another, but
+        walks bpy.data.materials only once.
+
+        Args:
+            clear_normals: Whether to unlink the normal input of Principled BSDFs.
+            opaque: Whether to set all materials to opaque blend mode.
+            transparency: Value for show_transparent_back of 'BLEND' materials,
+                or None to leave it unchanged.
+            ensure_pbr: Whether to convert materials without Principled BSDF.
+        """
+        for material in bpy.data.materials:
+            if clear_normals:
+                material.use_nodes = True
+                bsdf = material.node_tree.nodes.get("Principled BSDF")
+                if bsdf is not None and "Normal" in bsdf.inputs:
+                    for link in bsdf.inputs["Normal"].links:
+                        material.node_tree.links.remove(link)
+
+            if material.use_nodes:
+                if transparency is not None and material.blend_method == "BLEND":
+                    material.show_transparent_back = transparency
+                if opaque:
+                    material.blend_method = "OPAQUE"
+
+            if ensure_pbr and (
+                not material.use_nodes
+                or "Principled BSDF" not in material.node_tree.nodes
+            ):
+                convert_to_principled_bsdf(material)
+
     def update_scene_frames(
         self, mode: Literal["auto", "manual"] = "auto", num_frames: Optional[int] = None
     ):
@@ -214,6 +256,7 @@ class SceneManager:
             objects = [x for x in bpy.data.objects]
             for obj in objects:
                 bpy.data.objects.remove(obj, do_unlink=True)
+            clear_material_cache()
 
         # Clear all nodes
         if clear_nodes:
@@ -1,6 +1,8 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from PIL import Image
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import imageio
 import bpy
 
@@ -115,59 +117,119 @@ def convert_normal_to_webp(src: str, dst: str, src_render: str):
     Image.fromarray(normal_map.astype(np.uint8)).save(dst, "WEBP", quality=100)
 
 
-def convert_depth_to_webp(src: List[str], dst: List[str]) -> Tuple[float, float]:
+def save_images_parallel(
+    images: np.ndarray, dst: List[str], max_workers: Optional[int] = None, **kwargs
+):
+    """Encode and save a batch of uint8 images with a thread pool.
+
+    Args:
+        images: Array of shape (K, H, W) or (K, H, W, C)
+        dst: List of K output image paths
+        max_workers: Number of encoding threads. Defaults to os.cpu_count()
+        **kwargs: Extra arguments forwarded to PIL's Image.save
+    """
+    def save(index):
+        Image.fromarray(images[index]).save(dst[index], **kwargs)
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        list(executor.map(save, range(len(dst))))
+
+
+def convert_normals_batch(
+    src: List[str],
+    dst: List[str],
+    src_render: List[str],
+    max_workers: Optional[int] = None,
+):
+    """Convert a batch of normal maps from EXR to WEBP format.
+
+    All maps are stacked into one array so the conversion runs as a single
+    vectorized operation, and the encoding is spread over a thread pool.
+
+    Args:
+        src: Source EXR normal map paths
+        dst: Destination WEBP paths
+        src_render: Source render image paths for alpha channels
+        max_workers: Number of encoding threads. Defaults to os.cpu_count()
+    """
+    if len(src) == 0:
+        return
+
+    # Decode sequentially, Blender's image loading is not thread-safe
+    first = load_image(src[0], 3)
+    normals = np.empty((len(src),) + first.shape, dtype=np.float32)
+    normals[0] = first
+    for i, path in enumerate(src[1:], start=1):
+        normals[i] = load_image(path, 3)
+
+    # EXR data is already in 0-1 range, multiply by 255 for 8-bit format
+    normals = (np.clip(normals, 0.0, 1.0) * 255).astype(np.uint8)
+
+    alphas = np.full(normals.shape[:3], 255, dtype=np.uint8)
+    for i, path in enumerate(src_render):
+        try:
+            # Threshold alpha from render for binary mask
+            alphas[i] = np.where(load_image(path, 4)[:, :, 3] > 0, 255, 0)
+        except Exception as e:
+            print(f"Warning: Could not load alpha channel from render: {e}")
+
+    # Combine normal with alpha and flip images vertically before saving
+    images = np.ascontiguousarray(
+        np.concatenate([normals, alphas[..., None]], axis=-1)[:, ::-1]
+    )
+    save_images_parallel(images, dst, max_workers, format="WEBP", quality=100)
+
+
+def convert_depth_to_webp(
+    src: List[str], dst: List[str], max_workers: Optional[int] = None
+) -> Tuple[float, float]:
     """Convert depth EXR images to PNG format with normalization.
 
     Args:
         src: List of input EXR image paths
         dst: List of output PNG image paths
+        max_workers: Number of encoding threads. Defaults to os.cpu_count()
 
     Returns:
         Tuple[float, float]: (min_depth, scale) - The minimum depth value and scale factor used for normalization
     """
-    # Read all depth images
-    depth_images = []
-    valid_masks = []
-    min_depth = float("inf")
-    max_depth = float("-inf")
+    if len(src) == 0:
+        return float("inf"), 1.0
 
+    depths = []
     for path in src:
         # Read EXR image using Blender's image loading
         depth = load_image(path, num_channels=1)
         # Ensure we have a 2D array by taking the first channel if needed
         if depth.ndim > 2:
             depth = depth[..., 0]
-        # Create mask for valid depth values
-        mask = np.ones_like(depth, dtype=float)
-        mask[depth > 1000.0] = 0.0
-        depth[~(mask > 0.5)] = 0.0
+        depths.append(depth)
+    depths = np.stack(depths)
 
-        # Update min and max depth values
-        valid_depths = depth[mask > 0.5]
-        if len(valid_depths) > 0:
-            min_depth = min(min_depth, valid_depths.min())
-            max_depth = max(max_depth, valid_depths.max())
+    # Create mask for valid depth values
+    masks = depths <= 1000.0
+    depths[~masks] = 0.0
 
-        depth_images.append(depth)
-        valid_masks.append(mask)
+    valid_depths = depths[masks]
+    if len(valid_depths) > 0:
+        min_depth = valid_depths.min()
+        max_depth = valid_depths.max()
+    else:
+        min_depth = float("inf")
+        max_depth = float("-inf")
 
     # Calculate scale factor for normalization
     scale = 255.0 / (max_depth - min_depth) if max_depth > min_depth else 1.0
 
-    # Process and save each image
-    for depth, mask, output_path in zip(depth_images, valid_masks, dst):
-        # Normalize depth values
-        normalized_depth = (depth - min_depth) * scale
-        # Apply mask
-        normalized_depth[~(mask > 0.5)] = 0.0
-        # Convert to uint8
-        depth_uint8 = normalized_depth.astype(np.uint8)
-        # Convert single channel to RGB by repeating the channel
-        depth_rgb = np.dstack([depth_uint8] * 3)
-        # Flip image vertically before saving
-        depth_rgb = np.flipud(depth_rgb)
-        # Save using PIL
-        Image.fromarray(depth_rgb).save(output_path, quality=100)
+    # Normalize depth values and apply mask
+    normalized_depths = (depths - min_depth) * scale
+    normalized_depths[~masks] = 0.0
+    depths_uint8 = normalized_depths.astype(np.uint8)
+    # Convert single channel to RGB and flip images vertically before saving
+    depths_rgb = np.ascontiguousarray(
+        np.repeat(depths_uint8[..., None], 3, axis=-1)[:, ::-1]
+    )
+    save_images_parallel(depths_rgb, dst, max_workers, quality=100)
 
     return min_depth, scale
 